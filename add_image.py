@@ -2,100 +2,458 @@
 """
 Script to copy an image file to the images folder, add its filename to index.html,
 and push changes to GitHub for GitHub Pages publishing
-Usage: python add_image.py <image_file_path> [commit_message]
+Usage: python add_image.py [--wait-push] <image_file_path> [commit_message]
+       python add_image.py [--wait-push] --batch [commit_message] < image_list
+       python add_image.py [--wait-push] --import-dir <directory> [commit_message]
+
+By default 'git push' runs in the background after the commit is made, with
+its output logged to last_push.log in the git directory, and a failure is
+reported by the next run. --wait-push waits for it to finish, and is needed
+if git has to prompt for credentials.
 """
 
+import errno
+import functools
+import json
+import mmap
 import os
 import sys
 import shutil
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
 
-def add_image_to_html(image_filename, html_file='index.html'):
-    """
-    Add image filename to the const images array in index.html
-    """
-    if not os.path.exists(html_file):
-        print(f"Error: {html_file} not found!")
-        return False
 
-    # Read the HTML file
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+# Pattern to find the start of the const images = [...]; declaration. The end
+# is found with a plain find() rather than a lazy match across the file.
+_IMAGES_OPEN_RE = re.compile(rb'const\s+images\s*=\s*\[')
 
-    # Pattern to find the const images = [...]; declaration
-    pattern = r'(const\s+images\s*=\s*\[)(.*?)(\];)'
+# Returned by add_image_to_html when the image is already in the array
+UNCHANGED = "unchanged"
 
-    match = re.search(pattern, content, re.DOTALL)
+# File extensions picked up by --import-dir
+_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.svg'}
 
-    if not match:
-        print("Error: Could not find 'const images = [...];' in index.html")
-        return False
+# Executables are resolved to absolute paths up front so that subprocess can
+# start them with posix_spawn() instead of fork() + exec(). That fast path also
+# needs close_fds=False and no preexec_fn, pass_fds or cwd. Descriptors opened
+# by Python are non-inheritable by default, so leaving close_fds off is safe.
+_GIT = shutil.which("git") or "git"
+_SH = shutil.which("sh") or "sh"
 
-    # Extract the current array content
-    array_content = match.group(2).strip()
 
-    # Build the new array content
-    if array_content and not array_content.endswith(','):
-        # If there's existing content without trailing comma, add comma
-        if array_content.strip():
-            new_array_content = f'{array_content},\n      "{image_filename}"'
-        else:
-            new_array_content = f'\n      "{image_filename}"\n      '
+def _build_entry(array_content, image_filename):
+    """
+    Build the text to insert after the last item of the images array to
+    append image filename. Both arguments and the result are bytes.
+    """
+    if not array_content.strip():
+        # Empty array
+        return b'\n      "%s"\n      ' % image_filename
+    elif array_content.rstrip().endswith(b','):
+        # Already has trailing comma
+        return b'\n      "%s"' % image_filename
     else:
-        # Empty array or already has trailing comma
-        if array_content:
-            new_array_content = f'{array_content}\n      "{image_filename}"'
-        else:
-            new_array_content = f'\n      "{image_filename}"\n      '
-
-    # Replace the old array with the new one
-    new_content = re.sub(
-        pattern,
-        f'\\1{new_array_content}\\3',
-        content,
-        flags=re.DOTALL
-    )
+        # Existing content without trailing comma, add comma
+        return b',\n      "%s"' % image_filename
+
+
+def _cache_path(html_file):
+    """
+    Path of the sidecar file caching where the images array is in html_file
+    """
+    head, tail = os.path.split(html_file)
+    return os.path.join(head, f'.{tail}.cache')
+
+
+def _load_cached_span(html_file, st):
+    """
+    Return the cached (start, end) byte offsets of the images array contents,
+    or None if there is no cache or html_file changed since it was written
+    """
+    try:
+        with open(_cache_path(html_file), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        start, end = cache['start'], cache['end']
+        if (cache['mtime'] == st.st_mtime_ns and cache['size'] == st.st_size
+                and type(start) is int and type(end) is int
+                and 0 < start <= end <= st.st_size):
+            return start, end
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _save_cached_span(html_file, st, start, end):
+    """
+    Remember the byte offsets of the images array contents for html_file
+    """
+    try:
+        with open(_cache_path(html_file), 'w', encoding='utf-8') as f:
+            json.dump({
+                "mtime": st.st_mtime_ns,
+                "size": st.st_size,
+                "start": start,
+                "end": end
+            }, f)
+    except OSError:
+        pass
+
+
+def _find_array_span(f, st, html_file):
+    """
+    Find the (start, end) byte offsets of the images array contents,
+    from the cache if possible, otherwise by searching the file
+    """
+    span = _load_cached_span(html_file, st)
+    if span is not None:
+        # mtime and size can match after an edit (coarse timestamps, cp -p,
+        # same-length changes), so check the span still brackets the array
+        start, end = span
+        if start > 0:
+            f.seek(start - 1)
+            opening = f.read(1)
+            f.seek(end)
+            if opening == b'[' and f.read(2) == b'];':
+                return span
+
+    if st.st_size == 0:
+        return None
+
+    # Search a memory map of the file rather than reading it into memory
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        match = _IMAGES_OPEN_RE.search(mm)
+        if not match:
+            return None
+        end = mm.find(b'];', match.end())
+        if end == -1:
+            return None
+        return match.end(), end
+
+
+def add_image_to_html(image_filename, html_file='index.html', before_write=None):
+    """
+    Add image filename to the const images array in index.html.
+    Returns UNCHANGED if the array already contains it. before_write, if
+    given, is called just before the file is modified; if it raises, the
+    file is left untouched.
+    """
+    try:
+        f = open(html_file, 'r+b')
+    except FileNotFoundError:
+        print(f"Error: {html_file} not found!")
+        return False
 
-    # Write back to the file
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    with f:
+        st = os.fstat(f.fileno())
+        span = _find_array_span(f, st, html_file)
+
+        if span is None:
+            print("Error: Could not find 'const images = [...];' in index.html")
+            return False
+
+        start, end = span
+        f.seek(start)
+        array_content = f.read(end - start)
+
+        # The HTML is never decoded: the filename is encoded once instead
+        entry = image_filename.encode('utf-8')
+        if b'"%s"' % entry in array_content:
+            return UNCHANGED
+
+        if before_write is not None:
+            before_write()
+
+        delta = _build_entry(array_content, entry)
+
+        # Insert after the last item, keeping the whitespace before the ];.
+        # An empty array's whitespace is replaced, as the entry brings its own.
+        insert_at = len(array_content.rstrip())
+        kept = array_content[insert_at:] if insert_at else b''
+        tail = f.read()
+        f.seek(start + insert_at)
+        f.write(delta + kept + tail)
+        f.truncate()
+        f.flush()
+
+        _save_cached_span(
+            html_file,
+            os.fstat(f.fileno()),
+            start,
+            start + insert_at + len(delta) + len(kept)
+        )
 
     return True
 
 
-def run_git_command(command, error_message="Git command failed"):
+def run_git_command(command, error_message="Git command failed", capture=False):
     """
-    Run a git command and return the result
+    Run a git command, given as a list of arguments, and return the result.
+    stdout is only captured when capture is True; otherwise it is discarded
+    and an empty string is returned in its place. stderr is always captured
+    for error details.
     """
     try:
         result = subprocess.run(
             command,
-            shell=True,
             check=True,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            close_fds=False
         )
-        return True, result.stdout
+        return True, result.stdout if capture else ""
     except subprocess.CalledProcessError as e:
         print(f"Error: {error_message}")
         print(f"Details: {e.stderr}")
         return False, e.stderr
+    except FileNotFoundError as e:
+        print(f"Error: {error_message}")
+        print(f"Details: {e}")
+        return False, str(e)
 
 
+@functools.lru_cache(maxsize=None)
 def check_git_repo():
     """
-    Check if we're in a git repository
+    Check if we're in a git repository. A .git directory, or a .git file as
+    used by worktrees and submodules, in the current directory or a parent
+    is enough; otherwise git is asked. The result is cached for the process.
     """
+    path = os.getcwd()
+    while True:
+        if os.path.exists(os.path.join(path, '.git')):
+            return True
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+
+    # GIT_DIR and similar settings can still point at a repository
     success, _ = run_git_command(
-        "git rev-parse --git-dir",
+        [_GIT, "rev-parse", "--git-dir"],
         "Not a git repository. Please initialize git first with 'git init'"
     )
     return success
 
 
-def commit_and_push_changes(image_filename, commit_message=None):
+def has_pending_changes(paths):
+    """
+    Check whether git has uncommitted changes, staged or not, for any of the
+    given paths
+    """
+    if pygit2 is not None:
+        try:
+            repo = pygit2.Repository(os.getcwd())
+        except pygit2.GitError:
+            return False
+        for path in paths:
+            rel_path = os.path.relpath(os.path.abspath(path), repo.workdir)
+            try:
+                flags = repo.status_file(rel_path.replace(os.sep, '/'))
+            except (KeyError, pygit2.GitError):
+                continue
+            if flags not in (pygit2.GIT_STATUS_CURRENT, pygit2.GIT_STATUS_IGNORED):
+                return True
+        return False
+
+    success, output = run_git_command(
+        [_GIT, "status", "--porcelain", "--", *paths],
+        "Failed to check git status",
+        capture=True
+    )
+    return success and bool(output.strip())
+
+
+# Shell pipeline that adds and commits. $1 is the git executable, $2 the
+# commit message and any remaining arguments are paths to add. Each step
+# exits with its own status so a failure can be attributed to it.
+_COMMIT_SCRIPT = (
+    'git=$1; msg=$2; shift 2; '
+    '[ $# -eq 0 ] || "$git" add -- "$@" || exit 2; '
+    '"$git" commit -m "$msg" || exit 3'
+)
+
+# Error message for each failed publish step, by exit status
+_PUBLISH_ERRORS = {
+    1: "Not a git repository. Please initialize git first with 'git init'",
+    2: "Failed to add files to git",
+    3: "Failed to commit changes",
+    4: "Failed to push to GitHub. Make sure you have a remote repository set up.",
+}
+
+# Run for a background push. $1 is the git executable. git's exit status is
+# recorded as the last line of the log so the next run can report a failure.
+_PUSH_SCRIPT = '"$1" push; status=$?; echo "[push exited with status $status]"'
+_PUSH_STATUS_RE = re.compile(r'\[push exited with status (\d+)\]\s*$')
+
+
+def _commit_in_process(commit_message, paths=()):
+    """
+    Add the given paths and commit them with pygit2, without starting git.
+    Returns an exit status matching the steps of _COMMIT_SCRIPT and details.
+    """
+    try:
+        repo = pygit2.Repository(os.getcwd())
+    except pygit2.GitError as e:
+        return 1, str(e)
+
+    try:
+        index = repo.index
+        for path in paths:
+            rel_path = os.path.relpath(os.path.abspath(path), repo.workdir)
+            index.add(rel_path.replace(os.sep, '/'))
+        index.write()
+        tree = index.write_tree()
+    except (pygit2.GitError, OSError) as e:
+        return 2, str(e)
+
+    try:
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        if parents and repo[parents[0]].tree_id == tree:
+            return 3, "nothing to commit"
+        signature = repo.default_signature
+        repo.create_commit(
+            "HEAD", signature, signature, f"{commit_message.strip()}\n",
+            tree, parents
+        )
+    except (pygit2.GitError, KeyError) as e:
+        return 3, str(e)
+
+    return 0, ""
+
+
+def _push_log_path():
+    """
+    Path of the background push log in the git directory, which is not
+    ./.git for worktrees and submodules. Returns None outside a repository.
+    """
+    result = subprocess.run(
+        [_GIT, "rev-parse", "--git-dir"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        close_fds=False
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return os.path.join(result.stdout.strip(), 'last_push.log')
+
+
+def report_last_push():
+    """
+    Warn if the last background push failed. Each failure is reported once.
+    """
+    log_path = _push_log_path()
+    try:
+        with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+            log = f.read()
+    except (OSError, TypeError):
+        return
+
+    match = _PUSH_STATUS_RE.search(log)
+    if not match or match.group(1) == '0':
+        return
+
+    print("⚠️  The last background push to GitHub failed:")
+    print(log[:match.start()].rstrip())
+    print("   Run 'git push' manually, or use --wait-push if you need to enter")
+    print("   credentials or an SSH key passphrase.\n")
+
+    try:
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write("[failure reported]\n")
+    except OSError:
+        pass
+
+
+def _start_background_push():
+    """
+    Start 'git push' detached from this process, logging its output to the
+    git directory (or discarding it if that cannot be found). Returns the
+    log path.
+    """
+    log_path = _push_log_path() or os.devnull
+    with open(log_path, 'wb') as log_file:
+        subprocess.Popen(
+            [_SH, "-c", _PUSH_SCRIPT, "sh", _GIT],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+    return log_path
+
+
+def publish(commit_message, paths=(), wait_push=False):
+    """
+    Add the given paths, commit and push to GitHub. With pygit2 installed the
+    commit is made in process; otherwise add and commit run in a single shell
+    process. Unless wait_push is True, the push runs in the background and
+    this returns as soon as the commit is made.
+    """
+    report_last_push()
+
+    if pygit2 is not None:
+        status, details = _commit_in_process(commit_message, paths)
+    else:
+        result = subprocess.run(
+            [_SH, "-c", _COMMIT_SCRIPT, "sh", _GIT, commit_message, *paths],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            close_fds=False
+        )
+        status, details = result.returncode, result.stderr
+
+    if status == 0 and not wait_push:
+        log_path = _start_background_push()
+        print("\n✅ Committed! Pushing to GitHub in the background.")
+        if log_path != os.devnull:
+            print(f"   Progress and errors are logged to {log_path}.")
+        print("   Use --wait-push if you need to enter credentials for GitHub.")
+        return True
+
+    if status == 0:
+        # Pushing through git keeps the user's credential helpers and SSH setup
+        result = subprocess.run(
+            [_GIT, "push"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            close_fds=False
+        )
+        if result.returncode != 0:
+            status, details = 4, result.stderr
+
+    if status == 0:
+        print("\n✅ Successfully published to GitHub!")
+        print("   Your GitHub Pages site will update shortly.")
+        return True
+
+    print(f"Error: {_PUBLISH_ERRORS.get(status, 'Git command failed')}")
+    print(f"Details: {details}")
+
+    if status == 3:
+        # Check if there were no changes to commit
+        success, output = run_git_command(
+            [_GIT, "status", "--porcelain"], "", capture=True
+        )
+        if not output.strip():
+            print("  ℹ No changes to commit (file may already be in repository)")
+    elif status == 4:
+        print("\nℹ️  Changes committed locally but not pushed.")
+        print("   Run 'git push' manually or check your remote repository settings.")
+
+    return False
+
+
+def commit_and_push_changes(image_filename, commit_message=None, wait_push=False):
     """
     Commit changes and push to GitHub
     """
@@ -108,88 +466,305 @@ def commit_and_push_changes(image_filename, commit_message=None):
 
     print("\n📤 Publishing to GitHub...")
 
-    # Add the files
-    print("  → Adding files to git...")
-    success, _ = run_git_command(
-        f"git add images/{image_filename} index.html",
-        "Failed to add files to git"
+    print("  → Adding and committing changes...")
+    return publish(
+        commit_message,
+        [f"images/{image_filename}", "index.html"],
+        wait_push
     )
-    if not success:
-        return False
 
-    # Commit the changes
-    print(f"  → Committing changes...")
-    success, _ = run_git_command(
-        f'git commit -m "{commit_message}"',
-        "Failed to commit changes"
-    )
-    if not success:
-        # Check if there were no changes to commit
-        success, output = run_git_command("git status --porcelain", "")
-        if not output.strip():
-            print("  ℹ No changes to commit (file may already be in repository)")
+
+def add_images_in_batch(image_paths, commit_message=None, wait_push=False):
+    """
+    Add every image in image_paths, then commit and push them together.
+    The copies run concurrently, and a single long-running 'git update-index'
+    stages each image as it is added, instead of starting new git processes
+    for every image.
+    """
+    if not check_git_repo():
         return False
 
-    # Push to GitHub
-    print("  → Pushing to GitHub...")
-    success, _ = run_git_command(
-        "git push",
-        "Failed to push to GitHub. Make sure you have a remote repository set up."
+    stager = subprocess.Popen(
+        [_GIT, "update-index", "--add", "--stdin"],
+        stdin=subprocess.PIPE,
+        text=True,
+        close_fds=False
     )
 
-    if success:
-        print("\n✅ Successfully published to GitHub!")
-        print("   Your GitHub Pages site will update shortly.")
+    added = []
+    failed = False
+    with ThreadPoolExecutor() as executor:
+        # Start every copy up front so they run concurrently, then add the
+        # images to index.html one at a time as their copies finish. Images
+        # sharing a filename would be copied to the same destination at once,
+        # so only the first of them is kept.
+        copies = []
+        seen = set()
+        for image_path in image_paths:
+            image_filename = os.path.basename(image_path)
+            if image_filename in seen:
+                print(f"Warning: Skipping '{image_path}', an image named "
+                      f"'{image_filename}' is already in this batch")
+                continue
+            seen.add(image_filename)
+            copies.append((image_path, _start_copy(executor, image_path)))
+
+        for image_path, copy_future in copies:
+            if copy_future is None:
+                failed = True
+                continue
+            result = _finish_add(image_path, copy_future)
+            image_filename = os.path.basename(image_path)
+            if result == UNCHANGED:
+                # Already listed, but the image itself may still need
+                # committing if it was replaced or an earlier commit failed
+                if not has_pending_changes([f"images/{image_filename}"]):
+                    continue
+            elif not result:
+                failed = True
+                continue
+            stager.stdin.write(f"images/{image_filename}\n")
+            stager.stdin.flush()
+            added.append(image_filename)
+
+    if added:
+        stager.stdin.write("index.html\n")
+    stager.stdin.close()
+    if stager.wait() != 0:
+        print("Error: Failed to add files to git")
+        return False
+
+    if not added:
+        # Only a real error is a failure; images already listed are a no-op
+        if failed:
+            print("No images were added")
+            return False
+        print("No new images to add")
         return True
-    else:
-        print("\nℹ️  Changes committed locally but not pushed.")
-        print("   Run 'git push' manually or check your remote repository settings.")
+
+    # Default commit message if none provided
+    if not commit_message:
+        commit_message = f"Add {len(added)} images"
+
+    print(f"\n📤 Publishing {len(added)} images to GitHub...")
+
+    print("  → Committing changes...")
+    published = publish(commit_message, wait_push=wait_push)
+
+    # Publish what succeeded, but still report any image that was dropped
+    if failed:
+        print("\n⚠️  Some images could not be added; see the errors above.")
         return False
+    return published
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python add_image.py <image_file_path> [commit_message]")
-        print("\nExample:")
-        print("  python add_image.py photo.jpg")
-        print("  python add_image.py photo.jpg 'Add vacation photo'")
-        sys.exit(1)
+def _fast_copy(src, dst, src_st=None):
+    """
+    Copy src to dst inside the kernel where possible, preserving metadata
+    the same way shutil.copy2 does. src_st is an os.stat() result for src,
+    if the caller already has one.
+    """
+    if src_st is None:
+        src_st = os.stat(src)
 
-    image_path = sys.argv[1]
-    commit_message = sys.argv[2] if len(sys.argv) > 2 else None
+    try:
+        dst_st = os.stat(dst)
+    except FileNotFoundError:
+        pass
+    else:
+        if os.path.samestat(src_st, dst_st):
+            raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
 
+    if os.name == 'nt':
+        import ctypes
+        if not ctypes.windll.kernel32.CopyFileW(src, dst, False):
+            raise ctypes.WinError()
+    else:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+            remaining = src_st.st_size
+            offset = 0
+            use_copy_file_range = hasattr(os, 'copy_file_range')
+
+            # Reserve the whole file up front so it is allocated contiguously
+            if remaining and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(out_fd, 0, remaining)
+                except OSError:
+                    pass
+
+            # Both calls advance the destination's file position, so a
+            # fallback part way through carries on from the same offset
+            try:
+                while remaining > 0:
+                    if use_copy_file_range:
+                        try:
+                            copied = os.copy_file_range(
+                                in_fd, out_fd, remaining, offset
+                            )
+                        except OSError as e:
+                            if e.errno not in (errno.EXDEV, errno.ENOSYS,
+                                               errno.EINVAL, errno.EOPNOTSUPP):
+                                raise
+                            use_copy_file_range = False
+                            continue
+                    else:
+                        copied = os.sendfile(out_fd, in_fd, offset, remaining)
+
+                    if copied == 0:
+                        break
+                    offset += copied
+                    remaining -= copied
+            except OSError as e:
+                # sendfile() to a regular file is not supported everywhere
+                if e.errno not in (errno.EINVAL, errno.ENOSYS,
+                                   errno.ENOTSOCK, errno.EOPNOTSUPP):
+                    raise
+                fsrc.seek(offset)
+                shutil.copyfileobj(fsrc, fdst)
+
+            # Drop any preallocated space past the end if src shrank
+            fdst.truncate()
+
+    shutil.copystat(src, dst)
+
+
+def _start_copy(executor, image_path, images_folder='images'):
+    """
+    Submit the copy of an image into the images folder to executor.
+    Returns the future, or None if the image does not exist.
+    """
     # Check if the image file exists
-    if not os.path.exists(image_path):
+    try:
+        src_st = os.stat(image_path)
+    except FileNotFoundError:
         print(f"Error: Image file '{image_path}' not found!")
-        sys.exit(1)
+        return None
 
     # Create images folder if it doesn't exist
-    images_folder = 'images'
     os.makedirs(images_folder, exist_ok=True)
 
+    # Destination path
+    destination = os.path.join(images_folder, os.path.basename(image_path))
+
+    return executor.submit(_fast_copy, image_path, destination, src_st)
+
+
+def _finish_add(image_path, copy_future, images_folder='images'):
+    """
+    Find where to add an image in index.html while its copy runs, and only
+    write the entry once the copy has succeeded
+    """
     # Get the image filename
     image_filename = os.path.basename(image_path)
 
-    # Destination path
-    destination = os.path.join(images_folder, image_filename)
-
-    # Copy the image
     try:
-        shutil.copy2(image_path, destination)
-        print(f"✓ Copied '{image_filename}' to '{images_folder}/' folder")
-    except Exception as e:
-        print(f"Error copying file: {e}")
-        sys.exit(1)
+        result = add_image_to_html(
+            image_filename, before_write=copy_future.result
+        )
+        copy_future.result()
+    except Exception:
+        if copy_future.exception() is None:
+            raise
+        print(f"Error copying file: {copy_future.exception()}")
+        return False
+
+    print(f"✓ Copied '{image_filename}' to '{images_folder}/' folder")
 
-    # Update index.html
-    if add_image_to_html(image_filename):
+    # Report the index.html update
+    if result == UNCHANGED:
+        print(f"ℹ '{image_filename}' is already in index.html")
+    elif result:
         print(f"✓ Added '{image_filename}' to index.html")
     else:
         print("Failed to update index.html")
+
+    return result
+
+
+def add_image(image_path, images_folder='images'):
+    """
+    Copy an image into the images folder and add it to index.html.
+    Returns True if it was added, UNCHANGED if index.html already listed it,
+    or False if it could not be added.
+    """
+    # Copy the image in the background while index.html is updated
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        copy_future = _start_copy(executor, image_path, images_folder)
+        if copy_future is None:
+            return False
+        return _finish_add(image_path, copy_future, images_folder)
+
+
+def list_images(directory):
+    """
+    Return the paths of the image files directly inside directory, sorted
+    """
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.is_file()
+            and os.path.splitext(entry.name)[1].lower() in _IMAGE_EXTENSIONS
+        )
+
+
+def main():
+    # Wait for 'git push' to finish instead of running it in the background
+    wait_push = '--wait-push' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--wait-push']
+
+    if not args:
+        print("Usage: python add_image.py [--wait-push] <image_file_path> [commit_message]")
+        print("       python add_image.py [--wait-push] --batch [commit_message] < image_list")
+        print("       python add_image.py [--wait-push] --import-dir <directory> [commit_message]")
+        print("\nExample:")
+        print("  python add_image.py photo.jpg")
+        print("  python add_image.py photo.jpg 'Add vacation photo'")
+        print("  ls ~/Pictures/*.jpg | python add_image.py --batch")
+        print("  python add_image.py --import-dir ~/Pictures/vacation")
+        print("  python add_image.py --wait-push photo.jpg")
+        sys.exit(1)
+
+    # Add every image in a directory
+    if args[0] == '--import-dir':
+        if len(args) < 2:
+            print("Usage: python add_image.py --import-dir <directory> [commit_message]")
+            sys.exit(1)
+        try:
+            image_paths = list_images(args[1])
+        except OSError as e:
+            print(f"Error reading directory: {e}")
+            sys.exit(1)
+        commit_message = args[2] if len(args) > 2 else None
+        if not add_images_in_batch(image_paths, commit_message, wait_push):
+            sys.exit(1)
+        return
+
+    commit_message = args[1] if len(args) > 1 else None
+
+    # Read image paths from stdin, one per line
+    if args[0] == '--batch':
+        image_paths = [line.strip() for line in sys.stdin if line.strip()]
+        if not add_images_in_batch(image_paths, commit_message, wait_push):
+            sys.exit(1)
+        return
+
+    image_path = args[0]
+    result = add_image(image_path)
+    if not result:
         sys.exit(1)
 
+    # Nothing to publish if the image was already listed and committed. A
+    # replaced image, or an earlier run whose commit failed, still needs it.
+    image_filename = os.path.basename(image_path)
+    if result == UNCHANGED and not (
+        check_git_repo()
+        and has_pending_changes([f"images/{image_filename}", "index.html"])
+    ):
+        return
+
     # Commit and push to GitHub
-    commit_and_push_changes(image_filename, commit_message)
+    commit_and_push_changes(image_filename, commit_message, wait_push)
 
 
 if __name__ == "__main__":